@@ -5,17 +5,23 @@ from common.types import AgentCard, A2AClientJSONError
 
 class A2ACardResolver:
     def __init__(self,
-                 base_url, agent_card_path="/.well-known/agent.json"):
+                 base_url, agent_card_path="/.well-known/agent.json",
+                 http_client: httpx.Client | None = None):
         self.base_url = base_url.rstrip("/")
         self.agent_card_path = agent_card_path.lstrip("/")
+        self.http_client = http_client
 
     def get_agent_card(self) -> AgentCard:
+        if self.http_client is not None:
+            return self._fetch_agent_card(self.http_client)
         with httpx.Client() as client:
-            response = client.get(f"{self.base_url}/{self.agent_card_path}")
-            response.raise_for_status()
+            return self._fetch_agent_card(client)
 
-            try:
-                return AgentCard(**response.json())
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
+    def _fetch_agent_card(self, client: httpx.Client) -> AgentCard:
+        response = client.get(f"{self.base_url}/{self.agent_card_path}")
+        response.raise_for_status()
 
+        try:
+            return AgentCard(**response.json())
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
@@ -1,13 +1,58 @@
 import httpx
-from httpx_sse import connect_sse
-from typing import Any, AsyncIterable
+from typing import Any, AsyncIterable, AsyncIterator, Callable, TypeVar
+from pydantic import BaseModel, ValidationError
 from common.types import *
-import json
+
+JSON_HEADERS = {"content-type": "application/json"}
+SSE_HEADERS = {**JSON_HEADERS, "accept": "text/event-stream", "cache-control": "no-store"}
+
+T = TypeVar("T")
+
+
+def _to_json_bytes(model: BaseModel) -> bytes:
+    return model.__pydantic_serializer__.to_json(model)
+
+
+def _validate_response(validate_json: Callable[[str | bytes], T], data: str | bytes) -> T:
+    try:
+        return validate_json(data)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            raise A2AClientJSONError(str(e)) from e
+        raise
+
+
+async def _aiter_sse_data(response: httpx.Response) -> AsyncIterator[bytes]:
+    # Yields the data of each server-sent event. Lines are split on LF with a
+    # trailing CR dropped; fields other than data (event, id, retry, comments)
+    # are not used by A2A and are skipped.
+    buffer = bytearray()
+    scanned = 0
+    data: list[bytearray] = []
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        start = 0
+        # The first `scanned` bytes are a partial line already known to hold no LF.
+        while (end := buffer.find(b"\n", scanned)) != -1:
+            line = buffer[start:end]
+            start = scanned = end + 1
+            if line.endswith(b"\r"):
+                del line[-1:]
+            if not line:
+                if data:
+                    yield b"\n".join(data)
+                    data = []
+            elif line.startswith(b"data:"):
+                del line[:6 if line.startswith(b"data: ") else 5]
+                data.append(line)
+        del buffer[:start]
+        scanned = len(buffer)
 
 
 class A2AClient:
     def __init__(self, agent_card: AgentCard = None,
-                 url: str = None):
+                 url: str = None,
+                 http: httpx.AsyncClient | None = None):
         if agent_card:
             self.url = agent_card.url
         elif url:
@@ -15,45 +60,78 @@ class A2AClient:
         else:
             raise ValueError("Either agent_card or url must be provided")
 
-    async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
-        request = SendTaskRequest(**payload)
-        return SendTaskResponse(**await self._send_request(request))
-
-    async def send_task_streaming(self, payload: dict[str, Any]) -> AsyncIterable[SendTaskStreamingResponse]:
-        request = SendTaskStreamingRequest(**payload)
-        with httpx.Client(timeout=None) as client:
-            with connect_sse(client, "POST", self.url, json=request.model_dump()) as event_source:
-                try:
-                    for sse in event_source.iter_sse():
-                        yield SendTaskStreamingResponse(**json.loads(sse.data))
-                except json.JSONDecodeError as e:
-                    raise A2AClientJSONError(str(e)) from e
-                except httpx.HTTPError as e:
-                    raise A2AClientHTTPError(400, str(e)) from e
-
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(self.url, json=request.model_dump(), timeout=30)
+        # A caller-provided client is shared with others, so it is left open on aclose().
+        self._owns_client = http is None
+        self._client = http if http is not None else httpx.AsyncClient(
+            timeout=30,
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100))
+
+    async def aclose(self):
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def __aenter__(self) -> "A2AClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def send_task(self, payload: dict[str, Any] | TaskSendParams) -> SendTaskResponse:
+        request = SendTaskRequest(params=payload)
+        return _validate_response(SendTaskResponseAdapter.validate_json,
+                                  await self._send_request_bytes(request))
+
+    async def send_task_streaming(self, payload: dict[str, Any] | TaskSendParams) -> AsyncIterable[SendTaskStreamingResponse]:
+        request = SendTaskStreamingRequest(params=payload)
+        try:
+            async with self._client.stream("POST", self.url,
+                                           content=_to_json_bytes(request),
+                                           headers=SSE_HEADERS, timeout=None) as response:
                 response.raise_for_status()
-                return response.json()
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
-            except httpx.HTTPError as e:
-                raise A2AClientHTTPError(response.status_code, str(e)) from e
+                # Errors the server reports before streaming starts come back as a
+                # plain JSON response, which holds no events.
+                content_type = response.headers.get("content-type", "")
+                if not content_type.startswith("text/event-stream"):
+                    body = await response.aread()
+                    raise A2AClientHTTPError(
+                        response.status_code,
+                        f"Expected response header Content-Type to contain 'text/event-stream', "
+                        f"got {content_type!r}: {body.decode(errors='replace')}")
+                async for data in _aiter_sse_data(response):
+                    yield _validate_response(SendTaskStreamingResponseAdapter.validate_json, data)
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except httpx.HTTPError as e:
+            raise A2AClientHTTPError(400, str(e)) from e
+
+    async def _send_request_bytes(self, request: JSONRPCRequest) -> bytes:
+        try:
+            response = await self._client.post(self.url,
+                                               content=_to_json_bytes(request),
+                                               headers=JSON_HEADERS)
+            response.raise_for_status()
+            return response.content
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except httpx.HTTPError as e:
+            raise A2AClientHTTPError(400, str(e)) from e
 
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
-        request = GetTaskRequest(**payload)
-        return GetTaskResponse(**await self._send_request(request))
+        request = GetTaskRequest(params=payload)
+        return _validate_response(GetTaskResponseAdapter.validate_json,
+                                  await self._send_request_bytes(request))
 
     async def cancel_task(self, payload: dict[str, Any]) -> CancelTaskResponse:
-        request = CancelTaskRequest(**payload)
-        return CancelTaskResponse(**await self._send_request(request))
+        request = CancelTaskRequest(params=payload)
+        return _validate_response(CancelTaskResponse.model_validate_json,
+                                  await self._send_request_bytes(request))
 
     async def set_task_callback(self, payload: dict[str, Any]) -> SetTaskPushNotificationResponse:
-        request = SetTaskPushNotificationRequest(**payload)
-        return SetTaskPushNotificationResponse(**await self._send_request(request))
+        request = SetTaskPushNotificationRequest(params=payload)
+        return _validate_response(SetTaskPushNotificationResponse.model_validate_json,
+                                  await self._send_request_bytes(request))
 
     async def get_task_callback(self, payload: dict[str, Any]) -> GetTaskPushNotificationResponse:
-        request = GetTaskPushNotificationRequest(**payload)
-        return GetTaskPushNotificationResponse(**await self._send_request(request))
+        request = GetTaskPushNotificationRequest(params=payload)
+        return _validate_response(GetTaskPushNotificationResponse.model_validate_json,
+                                  await self._send_request_bytes(request))
@@ -43,8 +43,8 @@ class A2AServer:
 
     async def _process_request(self, request: Request):
         try:
-            body = await request.json()
-            json_rpc_request = A2ARequest.validate_json(body)
+            body = await request.body()
+            json_rpc_request = parse_a2a_request(body)
 
             if isinstance(json_rpc_request, GetTaskRequest):
                 result = await self.task_manager.on_get_task(json_rpc_request)
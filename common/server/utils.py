@@ -2,32 +2,43 @@ from common.types import (JSONRPCResponse,
                           ContentTypeNotSupportedError,
                           UnsupportedOperationalError)
 from typing import List
+import functools
+
+
+# The error models defer their schema build, so the shared instances are only
+# created the first time a request needs them.
+@functools.cache
+def _content_type_not_supported() -> ContentTypeNotSupportedError:
+    return ContentTypeNotSupportedError(
+        message="Content type not supported"
+    )
+
+
+@functools.cache
+def _operation_not_supported() -> UnsupportedOperationalError:
+    return UnsupportedOperationalError(
+        message="Operation not supported"
+    )
 
 
 def are_modalities_compatible(
         server_output_modes: List[str],
         client_output_modes: List[str]
 ):
-    if client_output_modes is None or len(client_output_modes) == 0:
-        return True
-    if server_output_modes is None or len(server_output_modes) == 0:
+    if not client_output_modes or not server_output_modes:
         return True
-    return any(x in server_output_modes for x in client_output_modes)
+    return not set(server_output_modes).isdisjoint(client_output_modes)
 
 
 def new_incompatible_types_error(request_id):
     return JSONRPCResponse(
         id=request_id,
-        error=ContentTypeNotSupportedError(
-            message="Content type not supported"
-        )
+        error=_content_type_not_supported()
     )
 
 
 def new_not_implemented_error(request_id):
     return JSONRPCResponse(
         id=request_id,
-        error=UnsupportedOperationalError(
-            message="Operation not supported"
-        )
+        error=_operation_not_supported()
     )
@@ -1,13 +1,18 @@
 from typing import Union, Any
 from pydantic import BaseModel, Field, TypeAdapter
 from enum import Enum
-from uuid import uuid4
+import os
+import orjson
 from datetime import datetime
 from pydantic import model_validator, ConfigDict, field_serializer
 from typing_extensions import Self
 from typing import Literal, List, Annotated, Optional
 
 
+def _new_id() -> str:
+    return os.urandom(16).hex()
+
+
 class TaskState(str, Enum):
     SUBMITTED = "submitted"
     WORKING = "working"
@@ -19,6 +24,7 @@ class TaskState(str, Enum):
 
 
 class TextPart(BaseModel):
+    model_config = ConfigDict(frozen=True)
     type: Literal['text'] = 'text'
     text: str
     meta_data: dict[str, Any] | None = None
@@ -116,6 +122,7 @@ class PushNotificationConfig(BaseModel):
 
 
 class TaskIdParams(BaseModel):
+    model_config = ConfigDict(frozen=True)
     id: str
     meta_data: dict[str, Any] | None = None
 
@@ -126,7 +133,7 @@ class TaskQueryParams(TaskIdParams):
 
 class TaskSendParams(BaseModel):
     id: str
-    sessionId: str = Field(default_factory=lambda: uuid4().hex)
+    sessionId: str = Field(default_factory=_new_id)
     message: Message
     acceptedOutputModels: Optional[List[str]] = None
     pushNotification: PushNotificationConfig | None = None
@@ -140,9 +147,13 @@ class TaskPushNotificationConfig(BaseModel):
 
 
 ## RPC Messages
+# Schemas for rarely used models are built on first use instead of at import.
+_LAZY = ConfigDict(defer_build=True)
+
+
 class JSONRPCMessage(BaseModel):
     jsonrpc: Literal["2.0"] = "2.0"
-    id: str | int | None = Field(default_factory=lambda: uuid4().hex)
+    id: str | int | None = Field(default_factory=_new_id)
 
 
 class JSONRPCRequest(JSONRPCMessage):
@@ -151,6 +162,7 @@ class JSONRPCRequest(JSONRPCMessage):
 
 
 class JSONRPCError(BaseModel):
+    model_config = ConfigDict(frozen=True)
     code: int
     message: str
     data: Any | None = None
@@ -203,6 +215,7 @@ class SetTaskPushNotificationRequest(JSONRPCRequest):
 
 
 class SetTaskPushNotificationResponse(JSONRPCResponse):
+    model_config = _LAZY
     result: TaskPushNotificationConfig | None = None
 
 
@@ -212,6 +225,7 @@ class GetTaskPushNotificationRequest(JSONRPCRequest):
 
 
 class GetTaskPushNotificationResponse(JSONRPCResponse):
+    model_config = _LAZY
     result: TaskPushNotificationConfig | None = None
 
 
@@ -235,74 +249,110 @@ A2ARequest = TypeAdapter(
     ]
 )
 
+_METHOD_MAP: dict[str, type[JSONRPCRequest]] = {
+    "tasks/send": SendTaskRequest,
+    "tasks/get": GetTaskRequest,
+    "tasks/cancel": CancelTaskRequest,
+    "tasks/setPushNotification/set": SetTaskPushNotificationRequest,
+    "tasks/pushNotification/get": GetTaskPushNotificationRequest,
+    "tasks/reSubscribe": TaskResubscribeRequest,
+    "tasks/sendSubscribe": SendTaskStreamingRequest,
+}
+
+
+def parse_a2a_request(body: str | bytes) -> JSONRPCRequest:
+    try:
+        request_type = _METHOD_MAP[orjson.loads(body)["method"]]
+    except (KeyError, TypeError):
+        # Unknown or missing method: let the union report the validation error.
+        return A2ARequest.validate_json(body)
+    return request_type.model_validate_json(body)
+
+
+SendTaskResponseAdapter = TypeAdapter(SendTaskResponse)
+SendTaskStreamingResponseAdapter = TypeAdapter(SendTaskStreamingResponse)
+GetTaskResponseAdapter = TypeAdapter(GetTaskResponse)
+
 
 # Error types
 class JSONParseError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32700
     message: str = "Invalid JSON payload"
     data: Any | None = None
 
 
 class InvalidRequestError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32600
     message: str = "Request payload validation error"
     data: Any | None = None
 
 
 class MethodNotFoundError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32601
     message: str = "Method not found"
     data: Any | None = None
 
 
 class InvalidParamsError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32602
     message: str = "Invalid method parameters"
     data: Any | None = None
 
 
 class InternalError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32603
     message: str = "Internal error"
     data: Any | None = None
 
 
 class TaskNotFoundError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32001
     message: str = "Task not found"
     data: None = None
 
 
 class TaskNotCancelableError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32002
     message: str = "Task cannot be cancelled"
     data: None = None
 
 
 class PushNotificationSupportedError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32003
     message: str = "Push notification is not supported"
     data: None = None
 
 
 class UnsupportedOperationalError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32004
     message: str = "Unsupported operational error"
     data: None = None
 
 
 class ContentTypeNotSupportedError(JSONRPCError):
+    model_config = _LAZY
     code: int = -32005
     message: str = "Content type not supported"
     data: None = None
 
 
 class AgentProvider(BaseModel):
+    model_config = ConfigDict(frozen=True)
     organization: str
     url: str | None = None
 
 
 class AgentCapabilities(BaseModel):
+    model_config = ConfigDict(frozen=True)
     streaming: bool = False
     pushNotification: bool = False
     stateTransitionHistory: bool = False
@@ -314,6 +364,7 @@ class AgentAuthentications(BaseModel):
 
 
 class AgentSkill(BaseModel):
+    model_config = ConfigDict(frozen=True)
     id: str
     name: str
     description: str | None = None
@@ -1,61 +1,99 @@
+import heapq
+import itertools
 import threading
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+_NUM_SHARDS = 16
 
 
 class InMemoryCache:
     _instance: Optional["InMemoryCache"] = None
-    _lock: threading.Lock = threading.Lock()
-    _initialized: bool = False
+    _lock: threading.RLock = threading.RLock()
 
     def __new__(cls) -> "InMemoryCache":
         if cls._instance is None:
             with cls._lock:
-                if not cls._initialized:
-                    cls._instance = super().__new__(cls)
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._init_shards()
+                    cls._instance = instance
 
         return cls._instance
 
-    def __init__(self):
-        if not self._initialized:
-            with self._lock:
-                if not self._initialized:
-                    self._cache_data: Dict[str, Dict[str, Any]] = {}
-                    self._ttl: Dict[str, float] = {}
-                    self._data_lock: threading.Lock = threading.Lock()
-                    self._initialized = True
+    def _init_shards(self):
+        self._cache_data: List[Dict[str, Any]] = [{} for _ in range(_NUM_SHARDS)]
+        self._ttl: List[Dict[str, float]] = [{} for _ in range(_NUM_SHARDS)]
+        self._ttl_heaps: List[List[Tuple[float, int, str]]] = [[] for _ in range(_NUM_SHARDS)]
+        self._ttl_counter = itertools.count()
+        self._data_locks: List[threading.Lock] = [threading.Lock() for _ in range(_NUM_SHARDS)]
+
+    @staticmethod
+    def _shard(key: str) -> int:
+        return hash(key) & (_NUM_SHARDS - 1)
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        with self._data_lock:
-            self._cache_data[key] = value
+        shard = self._shard(key)
+        cache_data = self._cache_data[shard]
+        ttls = self._ttl[shard]
+        with self._data_locks[shard]:
+            now = time.monotonic()
+            self._sweep(shard, now)
+            cache_data[key] = value
             if ttl is not None:
-                self._ttl[key] = time.time() + ttl
+                expire_at = now + ttl
+                ttls[key] = expire_at
+                heapq.heappush(self._ttl_heaps[shard], (expire_at, next(self._ttl_counter), key))
             else:
-                if key in self._ttl:
-                    del self._ttl[key]
+                ttls.pop(key, None)
+
+    # Must be called with the shard lock held.
+    def _sweep(self, shard: int, now: float):
+        heap = self._ttl_heaps[shard]
+        ttls = self._ttl[shard]
+        while heap and heap[0][0] <= now:
+            _, _, key = heapq.heappop(heap)
+            # The entry may be stale: the key was deleted or re-set since it was pushed.
+            expire_at = ttls.get(key)
+            if expire_at is not None and expire_at <= now:
+                del self._cache_data[shard][key]
+                del ttls[key]
 
     def get(self, key: str, default: Any = None) -> Any:
-        with self._data_lock:
-            if key in self._ttl \
-                    and time.time() > self._ttl[key]:
-                del self._cache_data[key]
-                del self._ttl[key]
-                return default
+        shard = self._shard(key)
+        cache_data = self._cache_data[shard]
+        ttls = self._ttl[shard]
+        expire_at = ttls.get(key)
+        if expire_at is not None and time.monotonic() > expire_at:
+            with self._data_locks[shard]:
+                expire_at = ttls.get(key)
+                if expire_at is None or time.monotonic() <= expire_at:
+                    return cache_data.get(key, default)
+                del cache_data[key]
+                del ttls[key]
+            return default
 
-            return self._cache_data.get(key, default)
+        return cache_data.get(key, default)
 
     def delete(self, key: str):
-        with self._data_lock:
-            if key in self._cache_data:
-                del self._cache_data[key]
-                if key in self._ttl:
-                    del self._ttl[key]
+        shard = self._shard(key)
+        cache_data = self._cache_data[shard]
+        with self._data_locks[shard]:
+            if key in cache_data:
+                del cache_data[key]
+                self._ttl[shard].pop(key, None)
                 return True
             return False
 
     def clear(self) -> bool:
-        with self._data_lock:
-            self._cache_data.clear()
-            self._ttl.clear()
+        for lock in self._data_locks:
+            lock.acquire()
+        try:
+            for cache_data, ttls, heap in zip(self._cache_data, self._ttl, self._ttl_heaps):
+                cache_data.clear()
+                ttls.clear()
+                heap.clear()
             return True
-        return False
+        finally:
+            for lock in self._data_locks:
+                lock.release()
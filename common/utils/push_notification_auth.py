@@ -1,38 +1,41 @@
 from jwcrypto import jwk
 from starlette.responses import JSONResponse
 from starlette.requests import Request
+import asyncio
 import uuid
 from typing import Any
 
 import jwt
 import time
-import json
+import orjson
 import hashlib
+import hmac
 import httpx
 import logging
 
-from jwt import PyJWK, PyJWKClient
+from jwt import PyJWK, PyJWKClient, PyJWKClientError, PyJWS
 
 logger = logging.getLogger(__name__)
 AUTH_HEADER_PREFIX = "Bearer "
+# Same lifespan PyJWKClient uses for its JWK set cache.
+JWKS_CACHE_LIFESPAN = 300
 
 
 class PushNotificationAuth:
-    def _calculate_request_body_sha256(self, data: dict[str, Any]):
-        body_str = json.dumps(
-            data,
-            ensure_ascii=False,
-            allow_nan=False,
-            separators=(",", ":"),
-            indent=None,
-        )
-        return hashlib.sha256(body_str.encode()).hexdigest()
+    def _serialize_request_body(self, data: dict[str, Any]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+    def _calculate_request_body_sha256(self, body: bytes):
+        return hashlib.sha256(body).hexdigest()
 
 
 class PushNotificationSenderAuth(PushNotificationAuth):
     def __init__(self):
         self.public_keys = []
         self.private_key_jwk: PyJWK = None
+        self._jws = PyJWS()
+        self._jwt_headers: dict[str, str] | None = None
+        self._signing_key = None
 
     @staticmethod
     async def verify_push_notification_url(url: str) -> bool:
@@ -52,24 +55,29 @@ class PushNotificationSenderAuth(PushNotificationAuth):
         key = jwk.JWK.generate(kty="RSA", size=2048, kid=str(uuid.uuid4()), use='sig')
         self.public_keys.append(key.export_public(as_dict=True))
         self.private_key_jwk = PyJWK.from_json(key.export_private())
+        self._jwt_headers = {"kid": self.private_key_jwk.key_id, "alg": "RS256", "typ": "JWT"}
+        self._signing_key = self.private_key_jwk.key
 
     def handle_jwks_endpoint(self, _request: Request):
         return JSONResponse({"keys": self.public_keys})
 
-    def _generate_jwt(self, data: dict[str, Any]):
+    def _generate_jwt(self, body: bytes):
         iat = int(time.time())
-        return jwt.encode({"iat": iat,
-                           "request_body_sha256": self._calculate_request_body_sha256(data)},
-                          key=self.private_key_jwk,
-                          headers={"kid": self.private_key_jwk.key_id},
-                          algorithm="RS256")
+        payload = orjson.dumps({"iat": iat,
+                                "request_body_sha256": self._calculate_request_body_sha256(body)})
+        return self._jws.encode(payload,
+                                key=self._signing_key,
+                                headers=self._jwt_headers,
+                                algorithm="RS256")
 
     async def send_push_notification(self, url: str, data: dict[str, Any]):
-        jwt_token = self._generate_jwt(data)
-        headers = {"Authorization": f'Bearer {jwt_token}'}
+        body = self._serialize_request_body(data)
+        jwt_token = self._generate_jwt(body)
+        headers = {"Authorization": f'Bearer {jwt_token}',
+                   "Content-Type": "application/json"}
         async with httpx.AsyncClient(timeout=10) as client:
             try:
-                response = await client.post(url, headers=headers, json=data)
+                response = await client.post(url, headers=headers, content=body)
                 response.raise_for_status()
                 logger.info(f"Sent push-notification to {url}")
             except Exception as e:
@@ -80,9 +88,34 @@ class PushNotificationReceiverAuth(PushNotificationAuth):
     def __init__(self):
         self.public_keys_jwks = []
         self.jwks_client = []
+        self.signing_keys: dict[str, PyJWK] = {}
+        self._signing_keys_expire_at = 0.0
 
     async def load_jwks(self, jwks_url: str):
-        self.jwks_client = PyJWKClient(jwks_url)
+        self.jwks_client = PyJWKClient(jwks_url, lifespan=JWKS_CACHE_LIFESPAN)
+        try:
+            await asyncio.to_thread(self._refresh_signing_keys)
+        except PyJWKClientError as e:
+            logger.warning(f"Failed to prefetch JWKS from {jwks_url}, keys will be fetched on demand: {e}")
+
+    def _refresh_signing_keys(self):
+        # Rebuilt from a fresh JWK set so keys removed by the sender stop verifying.
+        self.signing_keys = {key.key_id: key for key in self.jwks_client.get_signing_keys(refresh=True)}
+        self._signing_keys_expire_at = time.monotonic() + JWKS_CACHE_LIFESPAN
+
+    def _fetch_signing_key(self, kid: str | None) -> PyJWK:
+        self._refresh_signing_keys()
+        signing_key = self.signing_keys.get(kid)
+        if signing_key is None:
+            raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return signing_key
+
+    async def _get_signing_key(self, token: str) -> PyJWK:
+        kid = jwt.get_unverified_header(token).get("kid")
+        signing_key = self.signing_keys.get(kid)
+        if signing_key is None or time.monotonic() >= self._signing_keys_expire_at:
+            signing_key = await asyncio.to_thread(self._fetch_signing_key, kid)
+        return signing_key
 
     async def verify_push_notification(self, request: Request) -> bool:
         auth_header = request.headers.get("Authorization")
@@ -91,13 +124,13 @@ class PushNotificationReceiverAuth(PushNotificationAuth):
             return False
 
         token = auth_header[len(AUTH_HEADER_PREFIX):]
-        signing_key = self.jwks_client.get_signing_key_from_jwt(token)
+        signing_key = await self._get_signing_key(token)
 
         decode_token = jwt.decode(token, signing_key.key, algorithms=["RS256"],
                                   options={"require": ['iat', "request_body_sha256"]})
 
-        actual_body_sha256 = self._calculate_request_body_sha256(await request.json())
-        if actual_body_sha256 != decode_token["request_body_sha256"]:
+        actual_body_sha256 = self._calculate_request_body_sha256(await request.body())
+        if not hmac.compare_digest(actual_body_sha256, decode_token["request_body_sha256"]):
             raise ValueError("Invalid request body")
 
         if time.time() - decode_token["iat"] > 60 * 5:
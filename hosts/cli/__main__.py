@@ -37,27 +37,27 @@ async def cli(agent, session, history,
             notification_receiver_auth=push_notification_auth)
         push_notification_listener.start()
 
-    client = A2AClient(agent_card=card)
-    if session == 0:
-        session_id = uuid4().hex
-    else:
-        session_id = session
-
-    continue_loop = True
-    streaming = card.capabilities.streaming
+    async with A2AClient(agent_card=card) as client:
+        if session == 0:
+            session_id = uuid4().hex
+        else:
+            session_id = session
 
-    while continue_loop:
-        task_id = uuid4().hex
-        print("============ starting a new task ================")
+        continue_loop = True
+        streaming = card.capabilities.streaming
 
-        continue_loop = await  complete_task(client, streaming, use_push_notification, notif_receiver_host,
-                                             notif_receiver_port,
-                                             task_id, session_id)
-        if history and continue_loop:
+        while continue_loop:
+            task_id = uuid4().hex
             print("============ starting a new task ================")
-            task_response = await  client.get_task({"id": task_id,
-                                                    "historyLength": 10})
-            print(task_response.model_dump_json(include={"result": {"history": True}}))
+
+            continue_loop = await  complete_task(client, streaming, use_push_notification, notif_receiver_host,
+                                                 notif_receiver_port,
+                                                 task_id, session_id)
+            if history and continue_loop:
+                print("============ starting a new task ================")
+                task_response = await  client.get_task({"id": task_id,
+                                                        "historyLength": 10})
+                print(task_response.model_dump_json(include={"result": {"history": True}}))
 
 
 async def complete_task(client, streaming, use_push_notification, notif_receiver_host, notif_receiver_port, task_id,
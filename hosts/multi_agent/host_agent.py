@@ -1,13 +1,16 @@
 import sys
 import asyncio
-import json
+import orjson
 import functools
 import uuid
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Callable
 
+import httpx
+
 from google.genai import types
-import base64
+from binascii import a2b_base64
 
 from google.adk import Agent
 from google.adk.agents.invocation_context import InvocationContext
@@ -24,6 +27,34 @@ from common.types import (
 )
 
 
+_TERMINAL_STATES = frozenset({
+    TaskState.COMPLETED,
+    TaskState.CANCELLED,
+    TaskState.FAILED,
+    TaskState.UNKNOWN
+})
+
+
+def _on_input_required(agent_name: str, task: Task, tool_context: ToolContext):
+    tool_context.actions.skip_summarization = True
+    tool_context.actions.escalate = True
+
+
+def _on_cancelled(agent_name: str, task: Task, tool_context: ToolContext):
+    raise ValueError(f"Agent {agent_name} task {task.id} is cancelled")
+
+
+def _on_failed(agent_name: str, task: Task, tool_context: ToolContext):
+    raise ValueError(f"Agent {agent_name} task {task.id} is failed")
+
+
+_TASK_STATE_HANDLERS: dict[TaskState, Callable[[str, Task, ToolContext], None]] = {
+    TaskState.INPUT_REQUIRED: _on_input_required,
+    TaskState.CANCELLED: _on_cancelled,
+    TaskState.FAILED: _on_failed,
+}
+
+
 def convert_part(part: Part, tool_context: ToolContext):
     if part.type == 'text':
         return part.text
@@ -32,11 +63,10 @@ def convert_part(part: Part, tool_context: ToolContext):
 
     elif part.type == 'file':
         file_id = part.file.name
-        file_bytes = base64.b64decode(part.file.bytes)
         file_part = types.Part(
             inline_data=types.Blob(
-                mime_type=part.file.mime_type,
-                data=file_bytes))
+                mime_type=part.file.mimeType,
+                data=a2b_base64(part.file.bytes)))
         tool_context.save_artifact(file_id, file_part)
         tool_context.actions.skip_summarization = True
         tool_context.actions.escalate = True
@@ -45,49 +75,39 @@ def convert_part(part: Part, tool_context: ToolContext):
 
 
 def convert_parts(parts: list[Part], tool_context: ToolContext):
-    rval = []
-    for p in parts:
-        rval.append(convert_part(p, tool_context))
-    return rval
+    if all(p.type == 'text' for p in parts):
+        return [p.text for p in parts]
+    return [convert_part(p, tool_context) for p in parts]
 
 
 class HostAgent:
     def __init__(self,
                  remote_agent_addresses: List[str],
-                 task_callback: TaskUpdateCallback | None = None):
+                 task_callback: TaskUpdateCallback | None = None,
+                 max_concurrent_tasks: int = 16):
         self.task_callback = task_callback
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
 
-        for address in remote_agent_addresses:
-            card_resolver = A2ACardResolver(address)
-            card = card_resolver.get_agent_card()
+        with httpx.Client() as http_client, ThreadPoolExecutor(
+                max_workers=max(1, min(32, len(remote_agent_addresses)))) as executor:
+            cards = list(executor.map(
+                lambda address: A2ACardResolver(address, http_client=http_client).get_agent_card(),
+                remote_agent_addresses))
+
+        for card in cards:
             remote_connection = RemoteAgentConnections(card)
             self.remote_agent_connections[card.name] = remote_connection
             self.cards[card.name] = card
+        # Caps the in-flight send_task calls per remote agent.
+        self._slots: dict[str, asyncio.Semaphore] = {
+            name: asyncio.Semaphore(max_concurrent_tasks) for name in self.remote_agent_connections
+        }
         agent_info = []
         for ra in self.list_remote_agents():
-            agent_info.append(json.dumps(ra))
+            agent_info.append(orjson.dumps(ra).decode())
         self.agents = '\n'.join(agent_info)
-
-    def create_agent(self) -> Agent:
-        return Agent(
-            model="gemini-2.0-flash-001",
-            name="host_agent",
-            instruction=self.root_instruction,
-            before_model_callback=self.before_model_callback,
-            description=(
-                "This agent orchestrates the decomposition of the user request into tasks that can be performed by child agents."
-            ),
-            tools=[
-                self.list_remote_agents,
-                self.send_task,
-            ]
-        )
-
-    def root_instruction(self, context: ReadonlyContext) -> str:
-        current_agent = self.check_state(context)
-        return f"""You are a expert delegator that can delegate the user request to the
+        self._instruction_prefix = f"""You are a expert delegator that can delegate the user request to the
         appropriate remote agents.
 
         Discovery:
@@ -109,9 +129,32 @@ class HostAgent:
         Agents:
         {self.agents}
 
-        Current agent: {current_agent['active_agent']}
+        Current agent: """
+        self._instruction_suffix = """
         """
 
+    async def aclose(self):
+        await RemoteAgentConnections.aclose_shared_http()
+
+    def create_agent(self) -> Agent:
+        return Agent(
+            model="gemini-2.0-flash-001",
+            name="host_agent",
+            instruction=self.root_instruction,
+            before_model_callback=self.before_model_callback,
+            description=(
+                "This agent orchestrates the decomposition of the user request into tasks that can be performed by child agents."
+            ),
+            tools=[
+                self.list_remote_agents,
+                self.send_task,
+            ]
+        )
+
+    def root_instruction(self, context: ReadonlyContext) -> str:
+        current_agent = self.check_state(context)
+        return self._instruction_prefix + current_agent['active_agent'] + self._instruction_suffix
+
     def check_state(self, context: ReadonlyContext):
         state = context.state
         if ('session_id' in state and
@@ -179,23 +222,13 @@ class HostAgent:
             acceptedOutputModels=['text', 'text/plain', 'image/png'],
             meta_data={"conversation_id": session_id}
         )
-        task = await client.send_task(request, self.task_callback)
-        state['session_active'] = task.status.state not in [
-            TaskState.COMPLETED,
-            TaskState.CANCELLED,
-            TaskState.FAILED,
-            TaskState.UNKNOWN
-        ]
-
-        if task.status.state == TaskState.INPUT_REQUIRED:
-            tool_context.actions.skip_summarization = True
-            tool_context.actions.escalate = True
-
-        elif task.status.state == TaskState.CANCELLED:
-            raise ValueError(f"Agent {agent_name} task {task.id} is cancelled")
-
-        elif task.status.state == TaskState.FAILED:
-            raise ValueError(f"Agent {agent_name} task {task.id} is failed")
+        async with self._slots[agent_name]:
+            task = await client.send_task(request, self.task_callback)
+        state['session_active'] = task.status.state not in _TERMINAL_STATES
+
+        handle_state = _TASK_STATE_HANDLERS.get(task.status.state)
+        if handle_state:
+            handle_state(agent_name, task, tool_context)
 
         response = []
         if task.status.message:
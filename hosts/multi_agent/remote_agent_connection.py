@@ -1,7 +1,13 @@
-from typing import Callable
+import asyncio
+import collections
+import contextlib
+import inspect
+import itertools
+from typing import Any, Awaitable, Callable
 import uuid
 from common.types import (
     AgentCard,
+    Message,
     Task,
     TaskSendParams,
     TaskArtifactUpdateEvent,
@@ -10,83 +16,346 @@ from common.types import (
     TaskStatusUpdateEvent
 )
 
+import httpx
+
 from common.client import A2AClient
 
-TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
-TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
+class SubmittedTask:
+    # Stand-in for the SUBMITTED Task reported when a stream starts. Most callbacks
+    # only read id/sessionId, so the status is built on first access and to_task()
+    # returns a real Task for callbacks that need one.
+    __slots__ = ('id', 'sessionId', 'message', '_status')
+
+    artifacts = None
+    meta_data = None
+
+    def __init__(self, id: str, sessionId: str | None, message: Message):
+        self.id = id
+        self.sessionId = sessionId
+        self.message = message
+        self._status: TaskStatus | None = None
+
+    @property
+    def status(self) -> TaskStatus:
+        if self._status is None:
+            self._status = TaskStatus.model_construct(state=TaskState.SUBMITTED, message=self.message)
+        return self._status
+
+    @property
+    def history(self) -> list[Message]:
+        return [self.message]
+
+    def to_task(self) -> Task:
+        return Task.model_construct(
+            id=self.id,
+            sessionId=self.sessionId,
+            status=self.status,
+            history=self.history
+        )
+
+
+TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent | SubmittedTask
+# Callbacks may return None; nothing reads the returned task, so there is no
+# need to build one just to satisfy the signature.
+TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task | None | Awaitable[Task | None]]
+
+_END_OF_STREAM = object()
+_FINAL_TYPES = (TaskStatusUpdateEvent,)
+_CHUNK_EMA_ALPHA = 0.2
+
+
+def _is_final(result: TaskCallbackArg | None) -> bool:
+    return isinstance(result, _FINAL_TYPES) and result.final
+
+
+class _StreamBuffer:
+    # Single-producer/single-consumer buffer for one stream. A deque guarded by
+    # two events avoids the per-operation futures and bookkeeping of asyncio.Queue.
+    def __init__(self, maxsize: int):
+        self._items = collections.deque()
+        self._maxsize = maxsize
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    async def put(self, item):
+        while len(self._items) >= self._maxsize:
+            self._writable.clear()
+            await self._writable.wait()
+        self._items.append(item)
+        self._readable.set()
+
+    async def get_batch(self, n: int) -> list:
+        # Waits for at least one item, then takes up to n of the ready ones.
+        while not self._items:
+            self._readable.clear()
+            await self._readable.wait()
+        items = self._items
+        batch = [items.popleft() for _ in range(min(n, len(items)))]
+        self._writable.set()
+        return batch
 
 
 class RemoteAgentConnections:
-    def __init__(self, agent_card: AgentCard):
-        self.agent_client = A2AClient(agent_card)
+    __slots__ = ('agent_client', 'card', '_streaming', '_client_send', '_client_stream',
+                 'batch_size', 'flush_interval', 'min_stream_chunks', 'stream_probe_interval',
+                 '_avg_chunks', '_sends_since_stream',
+                 '_msg_id_base', '_msg_id_ctr', 'pending_tasks')
+
+    # One connection pool shared by every remote agent connection in the process.
+    _shared_http: httpx.AsyncClient | None = None
+
+    def __init__(self, agent_card: AgentCard,
+                 batch_size: int = 16,
+                 flush_interval: float = 0.02,
+                 min_stream_chunks: float = 1.5,
+                 stream_probe_interval: int = 8):
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        if flush_interval < 0:
+            raise ValueError(f"flush_interval must not be negative, got {flush_interval}")
+        self.agent_client = A2AClient(agent_card, http=self.get_http())
         self.card = agent_card
+        # The card does not change after discovery, so the per-call lookups are
+        # resolved once here.
+        self._streaming = bool(agent_card.capabilities and agent_card.capabilities.streaming)
+        self._client_send = self.agent_client.send_task
+        self._client_stream = self.agent_client.send_task_streaming
+        # Streaming events are handed to task_callback in batches of at most
+        # batch_size events, or every flush_interval seconds.
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Moving average of events per reply. Agents whose replies fit in
+        # min_stream_chunks events or fewer are called without streaming, with
+        # every stream_probe_interval-th call streamed to re-measure. None means
+        # there is no history yet, so the next call streams.
+        self.min_stream_chunks = min_stream_chunks
+        self.stream_probe_interval = stream_probe_interval
+        self._avg_chunks: float | None = None
+        self._sends_since_stream = 0
+
+        # Message ids are this connection's random base plus a counter, which is
+        # unique without calling uuid4 for every streamed message.
+        self._msg_id_base = uuid.uuid4().hex
+        self._msg_id_ctr = itertools.count()
 
-        self.conversation_name = None
-        self.conversation = None
         self.pending_tasks = set()
 
+    @classmethod
+    def get_http(cls) -> httpx.AsyncClient:
+        if cls._shared_http is None or cls._shared_http.is_closed:
+            cls._shared_http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=200, max_keepalive_connections=50),
+                timeout=httpx.Timeout(60.0, connect=5.0))
+        return cls._shared_http
+
+    @classmethod
+    async def aclose_shared_http(cls):
+        # The pool outlives any single connection, so whoever owns the connections
+        # closes it at shutdown. A later get_http() opens a new one.
+        http, cls._shared_http = cls._shared_http, None
+        if http is not None:
+            await http.aclose()
+
     def get_agent(self) -> AgentCard:
         return self.card
 
+    def _use_streaming(self) -> bool:
+        if not self._streaming:
+            return False
+        if (self._avg_chunks is None or self._avg_chunks > self.min_stream_chunks or
+                self._sends_since_stream >= self.stream_probe_interval):
+            self._sends_since_stream = 0
+            return True
+        self._sends_since_stream += 1
+        return False
+
+    def _record_chunks(self, chunks: int):
+        if self._avg_chunks is None:
+            self._avg_chunks = chunks
+        else:
+            self._avg_chunks += _CHUNK_EMA_ALPHA * (chunks - self._avg_chunks)
+
+    def _next_message_id(self) -> str:
+        return f"{self._msg_id_base}-{next(self._msg_id_ctr)}"
+
+    def _stamp_message_id(self, result: Task | TaskStatusUpdateEvent, meta: dict[str, Any] | None) -> None:
+        m = result.status.message
+        merge_metadata(m, meta)
+        if not m.meta_data:
+            m.meta_data = {}
+        if 'message_id' in m.meta_data:
+            m.meta_data['last_message_id'] = m.meta_data['message_id']
+        m.meta_data['message_id'] = self._next_message_id()
+
+    async def _drain(self, request: TaskSendParams, queue: "_StreamBuffer"):
+        try:
+            async with contextlib.aclosing(self._client_stream(request)) as stream:
+                async for response in stream:
+                    result = response.result
+                    await queue.put(result)
+                    if _is_final(result):
+                        break
+        except Exception:
+            await queue.put(_END_OF_STREAM)
+            raise
+        await queue.put(_END_OF_STREAM)
+
+    def _notify(self, task_callback: TaskUpdateCallback, result: TaskCallbackArg,
+                callback_tasks: list[asyncio.Task]):
+        # Async callbacks run concurrently with the stream and are awaited once it ends.
+        maybe_awaitable = task_callback(result, self.card)
+        if inspect.isawaitable(maybe_awaitable):
+            callback_task = asyncio.ensure_future(maybe_awaitable)
+            callback_tasks.append(callback_task)
+            self.pending_tasks.add(callback_task)
+            callback_task.add_done_callback(self.pending_tasks.discard)
+
+    def _flush(self, buffer: list[TaskCallbackArg], task_callback: TaskUpdateCallback,
+               callback_tasks: list[asyncio.Task]):
+        events = _coalesce_events(buffer)
+        buffer.clear()
+        for result in events:
+            self._notify(task_callback, result, callback_tasks)
+
     async def send_task(self,
                         request: TaskSendParams,
                         task_callback: TaskUpdateCallback | None) -> Task | None:
-        if self.card.capabilities.streaming:
+        # Request metadata is merged into every result and message metadata into
+        # its status message; both are looked up once rather than per event.
+        request_meta = request.meta_data
+        message_meta = request.message.meta_data
+        if self._use_streaming():
             task = None
+            chunks = 0
+            callback_tasks: list[asyncio.Task] = []
             if task_callback:
-                task_callback(Task(
-                    id=request.id,
-                    sessionId=request.sessionId,
-                    status=TaskStatus(
-                        state=TaskState.SUBMITTED,
-                        message=request.message,
-                    ),
-                    history=[request.message]
-                ), self.card)
-
-            async for response in self.agent_client.send_task_streaming(request.model_dump()):
-                merge_metadata(response.result, request)
-                if (hasattr(response.result, "status") and
-                        hasattr(response.result.status, "message") and response.result.status.message):
-
-                    merge_metadata(response.result.status.message, request.message)
-                    m = response.result.status.message
-
-                    if not m.meta_data:
-                        m.meta_data = {}
-                    if 'message_id' in m.meta_data:
-                        m.meta_data['last_message_id'] = m.meta_data['message_id']
-                    m.meta_data['message_id'] = str(uuid.uuid4())
-
-                if task_callback:
-                    task_callback(response.result, self.card)
-                if hasattr(response.result, "final") and response.result.final:
-                    break
+                self._notify(task_callback,
+                             SubmittedTask(request.id, request.sessionId, request.message),
+                             callback_tasks)
+
+            loop = asyncio.get_running_loop()
+            buffer: list[TaskCallbackArg] = []
+            last_flush = loop.time()
+            # The receiver drains the SSE stream at wire speed while this coroutine
+            # runs the callbacks; the bounded buffer applies backpressure.
+            queue = _StreamBuffer(maxsize=64)
+            recv_task = asyncio.create_task(self._drain(request, queue))
+            done = False
+            try:
+                while not done:
+                    # Whatever the receiver has buffered, up to what fills the current
+                    # batch, is processed in one pass.
+                    want = self.batch_size - len(buffer)
+                    if buffer:
+                        timeout = self.flush_interval - (loop.time() - last_flush)
+                        try:
+                            batch = await asyncio.wait_for(queue.get_batch(want), max(timeout, 0))
+                        except asyncio.TimeoutError:
+                            self._flush(buffer, task_callback, callback_tasks)
+                            last_flush = loop.time()
+                            continue
+                    else:
+                        batch = await queue.get_batch(want)
+
+                    for result in batch:
+                        if result is _END_OF_STREAM:
+                            await recv_task
+                            done = True
+                            break
+
+                        chunks += 1
+                        merge_metadata(result, request_meta)
+                        if (isinstance(result, (Task, TaskStatusUpdateEvent)) and
+                                result.status.message is not None):
+                            self._stamp_message_id(result, message_meta)
+
+                        if task_callback:
+                            buffer.append(result)
+                        if _is_final(result):
+                            done = True
+                            break
+
+                    if buffer and (done or len(buffer) >= self.batch_size or
+                                   loop.time() - last_flush >= self.flush_interval):
+                        self._flush(buffer, task_callback, callback_tasks)
+                        last_flush = loop.time()
+            except Exception:
+                # Events received before the failure still reach the callback.
+                if buffer:
+                    self._flush(buffer, task_callback, callback_tasks)
+                if callback_tasks:
+                    await asyncio.gather(*callback_tasks, return_exceptions=True)
+                raise
+            finally:
+                # After the final event the receiver is only closing the stream, so
+                # it is left to finish; on failure it is cancelled. Either way it is
+                # awaited so a close error is not reported as never retrieved.
+                if not done:
+                    recv_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await recv_task
+            if buffer:
+                self._flush(buffer, task_callback, callback_tasks)
+            self._record_chunks(chunks)
+            if callback_tasks:
+                await asyncio.gather(*callback_tasks)
             return task
         else:
-            response = await self.agent_client.send_task(request.model_dump())
-            merge_metadata(response.result, request)
-
-            if (hasattr(response.result, "status") and
-                    hasattr(response.result.status, "message") and
-                    response.result.status.message):
-                merge_metadata(response.result.status.message, request.message)
-                m = response.result.status.message
-                if not m.meta_data:
-                    m.meta_data = {}
-                if 'message_id' in m.meta_data:
-                    m.meta_data['last_message_id'] = m.meta_data['message_id']
-                m.meta_data['message_id'] = str(uuid.uuid4())
+            response = await self._client_send(request)
+            result = response.result
+            merge_metadata(result, request_meta)
+
+            if (isinstance(result, Task) and
+                    result.status.message is not None):
+                self._stamp_message_id(result, message_meta)
+            if self._streaming and isinstance(result, Task):
+                if result.status.state == TaskState.WORKING:
+                    # The reply was not short after all; stream the next one again.
+                    self._avg_chunks = None
+                else:
+                    # Streamed, this reply would have been one event per artifact
+                    # plus the final status.
+                    self._record_chunks(1 + len(result.artifacts or ()))
 
             if task_callback:
-                task_callback(response.result)
-            return response.result
+                callback_tasks: list[asyncio.Task] = []
+                self._notify(task_callback, result, callback_tasks)
+                if callback_tasks:
+                    await asyncio.gather(*callback_tasks)
+            return result
 
 
-def merge_metadata(target, source):
-    if not hasattr(target, 'meta_data') or not hasattr(source, 'meta_data'):
+def merge_metadata(target, meta: dict[str, Any] | None):
+    # The target is None when a response has no result.
+    if not meta or target is None:
         return
-    if target.meta_data and source.meta_data:
-        target.meta_data.update(source.meta_data)
-    elif source.meta_data:
-        target.meta_data = dict(**source.meta_data)
+    target_meta = target.meta_data
+    if target_meta:
+        target_meta.update(meta)
+    else:
+        target.meta_data = meta.copy()
+
+
+def _coalesce_events(events: list[TaskCallbackArg]) -> list[TaskCallbackArg]:
+    # Folds runs of status updates that share a state into one event; artifact
+    # updates and state transitions are kept as they are, in order.
+    merged: list[TaskCallbackArg] = []
+    for event in events:
+        last = merged[-1] if merged else None
+        if (isinstance(event, TaskStatusUpdateEvent) and
+                isinstance(last, TaskStatusUpdateEvent) and
+                last.status.state == event.status.state):
+            merged[-1] = _merge_status_events(last, event)
+        else:
+            merged.append(event)
+    return merged
+
+
+def _merge_status_events(first: TaskStatusUpdateEvent,
+                         second: TaskStatusUpdateEvent) -> TaskStatusUpdateEvent:
+    if first.status.message and second.status.message:
+        second.status.message.parts[:0] = first.status.message.parts
+    elif first.status.message:
+        second.status.message = first.status.message
+    return second